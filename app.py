@@ -3,39 +3,62 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import json
-import time
-import random
+import orjson
 from io import BytesIO
 import base64
+from types import MappingProxyType
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import re
+from collections import deque
+from itertools import count, islice
+import tempfile
 
 # --- Event Persistence Utilities ---
+def _atomic_write(path, data):
+    """Write bytes to a temp file and swap it in, so readers never see a truncated file"""
+    # NamedTemporaryFile creates 0600 files; keep the target's mode (or the usual 0644 for a new file)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(os.path.abspath(path)), delete=False) as tmp:
+        try:
+            tmp.write(data)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
 EVENTS_FILE = "events.json"
+_fromiso = datetime.fromisoformat
 
 def load_events():
     try:
-        with open(EVENTS_FILE, "r") as f:
-            events = json.load(f)
-            # Convert 'time' field back to datetime
+        with open(EVENTS_FILE, "rb") as f:
+            events = orjson.loads(f.read())
+            # Convert 'time' field back to datetime (always stored as ISO string)
             for e in events:
-                if isinstance(e.get('time'), str):
-                    e['time'] = datetime.fromisoformat(e['time'])
+                e['time'] = _fromiso(e['time'])
             return events
     except Exception:
         return []
 
 def save_events(events):
-    # Convert datetime to isoformat for JSON serialization
-    serializable = []
-    for e in events:
-        e_copy = e.copy()
-        if isinstance(e_copy.get('time'), datetime):
-            e_copy['time'] = e_copy['time'].isoformat()
-        serializable.append(e_copy)
-    with open(EVENTS_FILE, "w") as f:
-        json.dump(serializable, f, indent=2)
+    # orjson serializes datetime natively as ISO 8601 (but not deque, hence list())
+    _atomic_write(EVENTS_FILE, orjson.dumps(list(events), option=orjson.OPT_INDENT_2))
+
+@st.cache_resource
+def event_id_counter():
+    """Process-wide event id counter, continuing after the highest persisted id"""
+    return count(max((int(e['id']) for e in load_events()), default=0) + 1)
 
 # --- End Event Persistence Utilities ---
 
@@ -44,25 +67,35 @@ TODOS_FILE = "todos.json"
 
 def load_todos():
     try:
-        with open(TODOS_FILE, "r") as f:
-            return json.load(f)
+        with open(TODOS_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         return []
 
 def save_todos(todos):
-    with open(TODOS_FILE, "w") as f:
-        json.dump(todos, f, indent=2)
+    # Skip the write when nothing changed since this session's last save. The hash is
+    # per session, so if another session has rewritten todos.json since, its content stays.
+    todos_hash = hash(tuple((t['event'], t['risk'], t['action'], t['done']) for t in todos))
+    if st.session_state.get('_todos_hash') == todos_hash:
+        return
+    _atomic_write(TODOS_FILE, orjson.dumps(todos, option=orjson.OPT_INDENT_2))
+    st.session_state._todos_hash = todos_hash
 # --- End Todo Persistence Utilities ---
 
 # --- AI Todo List Utilities ---
+# Matches one "Event: ... | Risk: ... | Action: ..." line of the Dashboard todo response
+# Horizontal whitespace only, so a match never runs onto the next line
+_TODO_RE = re.compile(r'Event:[ \t]*(.*?)[ \t]*\|[ \t]*Risk:[ \t]*(.*?)[ \t]*\|[ \t]*Action:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+# Bullet, numbering and whitespace characters trimmed from each AI list line
+_STRIP_CHARS = '-•* 1234567890.\t'
+
 def extract_todos_from_ai(ai_analysis_text):
     """Extract todo/action items from AI analysis text (expects bullet points or numbered list)"""
-    todos = []
-    for line in ai_analysis_text.splitlines():
-        line = line.strip('-•* 1234567890.').strip()
-        if line:
-            todos.append(line)
-    return todos
+    return [
+        item for line in ai_analysis_text.splitlines()
+        if (item := line.strip(_STRIP_CHARS).strip())
+    ]
 # --- End AI Todo List Utilities ---
 
 # Page configuration
@@ -134,69 +167,135 @@ def get_gemini_api_key():
         st.error("❌ GEMINI_API_KEY not found in Streamlit secrets. Please add it to your .streamlit/secrets.toml file.")
         return None
 
-def call_gemini_api(prompt, api_key):
-    """Call Gemini 2.5 experimental via OpenRouter API with the given prompt"""
-    if not api_key:
-        return None
+@st.cache_resource
+def get_http_session():
+    """Process-wide HTTP session so TLS connections to OpenRouter survive Streamlit reruns"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    session.headers.update({"Content-Type": "application/json"})
+    return session
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+GEMINI_MODEL = "google/gemini-2.5-experimental"
+
+def _post_gemini_request(prompt, api_key, stream=False):
+    """POST the prompt to OpenRouter's chat completions endpoint, optionally as an SSE stream"""
     headers = {
-        "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key}"
     }
     data = {
-        "model": "google/gemini-2.5-experimental",
+        "model": GEMINI_MODEL,
         "messages": [
             {"role": "user", "content": prompt}
         ]
     }
+    if stream:
+        data["stream"] = True
+
+    return get_http_session().post(
+        OPENROUTER_URL,
+        headers=headers,
+        json=data,
+        stream=stream,
+        timeout=90
+    )
+
+def _call_gemini_api_uncached(prompt, api_key):
+    """POST the prompt to OpenRouter; raises RuntimeError on a non-200 response"""
+    response = _post_gemini_request(prompt, api_key)
+    if response.status_code != 200:
+        raise RuntimeError(f"API Error: {response.status_code} - {response.text}")
+    result = response.json()
+    if "choices" in result and len(result["choices"]) > 0:
+        return result["choices"][0]["message"]["content"]
+    return "No response generated"
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _call_gemini_api_cached(prompt, _api_key):
+    # Leading underscore keeps the API key out of the cache hash
+    return _call_gemini_api_uncached(prompt, _api_key)
+
+def call_gemini_api(prompt, api_key, use_cache=True):
+    """Call Gemini 2.5 experimental via OpenRouter API with the given prompt (cached per prompt for an hour unless use_cache is False)"""
+    if not api_key:
+        return None
 
+    # Errors are raised inside the cached call so they are never memoized
+    fetch = _call_gemini_api_cached if use_cache else _call_gemini_api_uncached
     try:
-        response = requests.post(
-            url,
-            headers=headers,
-            json=data,
-            timeout=90
-        )
-        if response.status_code == 200:
-            result = response.json()
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                return "No response generated"
-        else:
-            return f"API Error: {response.status_code} - {response.text}"
+        return fetch(prompt, api_key)
+    except RuntimeError as e:
+        return str(e)
     except Exception as e:
         return f"Request Error: {str(e)}"
 
+def is_api_error(result):
+    """True when call_gemini_api returned one of its error strings instead of model output"""
+    return result.startswith(("API Error:", "Request Error:"))
+
+def split_ai_sections(ai_text):
+    """Split a batched AI response into a dict keyed by its '### SECTION: <NAME>' markers"""
+    sections = {}
+    for chunk in ai_text.split("### SECTION:")[1:]:
+        name, _, body = chunk.partition("\n")
+        sections[name.strip()] = body.strip()
+    return sections
+
+def stream_gemini_api(prompt, api_key):
+    """Yield the Gemini response text chunk by chunk from OpenRouter's SSE stream; raises RuntimeError on an API error"""
+    with _post_gemini_request(prompt, api_key, stream=True) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"API Error: {response.status_code} - {response.text}")
+        for line in response.iter_lines():
+            # Skip keep-alive comments and blank lines between events
+            if not line.startswith(b"data: "):
+                continue
+            payload = line[6:]
+            if payload == b"[DONE]":
+                break
+            chunk = orjson.loads(payload)
+            # Errors after the 200 status arrive as an SSE event with an "error" key
+            error = chunk.get("error")
+            if error:
+                message = error.get("message", error) if isinstance(error, dict) else error
+                raise RuntimeError(f"API Error: {message}")
+            choices = chunk.get("choices")
+            if choices:
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
 # Initialize session state
+# Histories are newest-first deques: O(1) appendleft and capped length
+HISTORY_MAXLEN = 500
 if 'events' not in st.session_state:
-    st.session_state.events = load_events()
+    # The file is newest-first and deque(maxlen) keeps the *last* items, so cut the head first
+    st.session_state.events = deque(islice(load_events(), HISTORY_MAXLEN), maxlen=HISTORY_MAXLEN)
 if 'orchestrator_log' not in st.session_state:
-    st.session_state.orchestrator_log = []
+    st.session_state.orchestrator_log = deque(maxlen=HISTORY_MAXLEN)
 if 'alerts' not in st.session_state:
-    st.session_state.alerts = []
+    st.session_state.alerts = deque(maxlen=HISTORY_MAXLEN)
 if 'monthly_reviews' not in st.session_state:
     st.session_state.monthly_reviews = []
 if 'todos' not in st.session_state:
     st.session_state.todos = load_todos()
 
-# Sample data
-assets = [
+# Sample data (read-only so no page can mutate it by accident)
+assets = tuple(MappingProxyType(d) for d in (
     {'id': 1, 'name': 'Turbine #1', 'status': 'Healthy', 'risk': 'Low', 'trend': '+2%'},
     {'id': 2, 'name': 'Pipeline A', 'status': 'At Risk', 'risk': 'Medium', 'trend': '-1%'},
     {'id': 3, 'name': 'Turbine #3', 'status': 'Critical', 'risk': 'High', 'trend': '-5%'}
-]
+))
 
 compliance = 92
 cost = 1.23
 cost_unit = 'M'
 
-training = [
+training = tuple(MappingProxyType(d) for d in (
     {'name': 'Alice', 'status': 'Complete', 'expires': '2025-01-10'},
     {'name': 'Bob', 'status': 'Expiring', 'expires': '2024-07-01'},
     {'name': 'Carlos', 'status': 'Expired', 'expires': '2024-04-01'}
-]
+))
 
 ai_insights = [
     'Optimize turbine #3 maintenance schedule',
@@ -214,33 +313,52 @@ benefits_info = {
     'Data Silos': 'Legacy: Data scattered. New: Unified cloud hub.'
 }
 
-alert_types = {
+@st.cache_resource
+def build_static_frames():
+    """Build the read-only display DataFrames once per process instead of on every rerun"""
+    asset_df = pd.DataFrame([dict(a) for a in assets])
+    training_df = pd.DataFrame([dict(t) for t in training])
+    benefits_df = pd.DataFrame([
+        {"Feature": feature, "Description": description}
+        for feature, description in benefits_info.items()
+    ])
+    benefits_chart_df = pd.DataFrame({
+        'Feature': list(benefits_info.keys()),
+        'Benefit_Score': [95, 90, 85, 80, 75]  # Example scores
+    })
+    return asset_df, training_df, benefits_df, benefits_chart_df
+
+ASSET_DF, TRAINING_DF, BENEFITS_DF, BENEFITS_CHART_DF = build_static_frames()
+
+alert_types = MappingProxyType({name: MappingProxyType(d) for name, d in {
     'Critical Safety': {'class': 'alert-critical', 'timing': 0, 'auto': 'Shutdown command issued', 'urgency': 60},
     'Compliance Drift': {'class': 'alert-compliance', 'timing': 3600, 'auto': 'Draft gap report generated', 'urgency': 3600},
     'Asset Failure Risk': {'class': 'alert-asset', 'timing': 900, 'auto': 'Maintenance task scheduled', 'urgency': 900},
     'Rounding': {'class': 'alert-rounding', 'timing': 14400, 'auto': 'Small alert & data adjust', 'urgency': 14400},
     'Training Lapse': {'class': 'alert-training', 'timing': 86400, 'auto': 'Auto-assign micro-course', 'urgency': 86400}
-}
+}.items()})
 
 # Map AI risk to urgency and style
-risk_to_alert = {
+risk_to_alert = MappingProxyType({risk: MappingProxyType(d) for risk, d in {
     'High':    {'class': 'alert-critical',    'urgency': 60},
     'Medium':  {'class': 'alert-asset',      'urgency': 900},
     'Low':     {'class': 'alert-rounding',   'urgency': 14400},
     'Training':{'class': 'alert-training',   'urgency': 86400},
     'Compliance': {'class': 'alert-compliance', 'urgency': 3600},
-}
-
-def time_ago(date):
-    """Convert datetime to relative time string"""
-    now = datetime.now()
-    diff = now - date
-    if diff.days > 0:
-        return f"{diff.days} days ago"
-    elif diff.seconds > 3600:
-        return f"{diff.seconds // 3600} hours ago"
-    elif diff.seconds > 60:
-        return f"{diff.seconds // 60} minutes ago"
+}.items()})
+
+def time_ago(now, date):
+    """Convert datetime to relative time string (callers pass a shared `now` per render loop)"""
+    secs = int((now - date).total_seconds())
+    days, rem = divmod(secs, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
+    if days > 0:
+        return f"{days} days ago"
+    elif hours > 0:
+        return f"{hours} hours ago"
+    elif minutes > 0:
+        return f"{minutes} minutes ago"
     else:
         return "Just now"
 
@@ -253,6 +371,7 @@ def format_urgency(alert):
     else:
         return f"{alert['urgency'] // 86400}d"
 
+@st.cache_data(show_spinner=False)
 def create_gauge_chart(value, title, color='blue'):
     """Create a gauge chart using plotly"""
     fig = go.Figure(go.Indicator(
@@ -278,6 +397,7 @@ def create_gauge_chart(value, title, color='blue'):
     fig.update_layout(height=300)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_cost_dial():
     """Create cost vs budget dial"""
     fig = go.Figure(go.Indicator(
@@ -303,11 +423,16 @@ def create_cost_dial():
     fig.update_layout(height=300)
     return fig
 
+@st.cache_resource
+def alert_id_counter():
+    """Process-wide alert id counter; ids double as Dismiss button keys"""
+    return count(1)
+
 def add_alert_dynamic(event, risk_level, auto_action=None):
     """Add a new alert with dynamic risk/urgency/class"""
     alert_def = risk_to_alert.get(risk_level, risk_to_alert['Low'])
     alert = {
-        'id': time.time() + random.random(),
+        'id': next(alert_id_counter()),
         'type': risk_level,
         'class': alert_def['class'],
         'auto': auto_action or '',
@@ -316,7 +441,7 @@ def add_alert_dynamic(event, risk_level, auto_action=None):
         'urgency': alert_def['urgency'],
         'dismissed': False
     }
-    st.session_state.alerts.insert(0, alert)
+    st.session_state.alerts.appendleft(alert)
 
 def process_orchestrator_decision(event, answers):
     """Process orchestrator decision and determine outcome"""
@@ -343,12 +468,28 @@ def process_orchestrator_decision(event, answers):
         'timestamp': datetime.now()
     }
     
-    st.session_state.orchestrator_log.insert(0, orchestrator_entry)
+    st.session_state.orchestrator_log.appendleft(orchestrator_entry)
     event['status'] = outcome
     add_alert_dynamic(event, alert_type) # Changed to add_alert_dynamic
     
     return outcome, color
 
+def recent_events_hash():
+    """Hash of the ten most recent events' ids and statuses, used to detect changes between reruns"""
+    return hash(tuple((e['id'], e['status']) for e in islice(st.session_state.events, 10)))
+
+def recent_events_text(events_hash):
+    """Prompt summary of the ten most recent events, rebuilt only when events_hash changes"""
+    cached = st.session_state.get('_events_text')
+    if cached and cached[0] == events_hash:
+        return cached[1]
+    events_text = "\n".join(
+        f"{e['type']}: {e['details']} (Status: {e['status']})"
+        for e in islice(st.session_state.events, 10)
+    )
+    st.session_state._events_text = (events_hash, events_text)
+    return events_text
+
 # Setup Gemini API
 api_key = get_gemini_api_key()
 
@@ -399,13 +540,13 @@ elif page == "Entry Points":
         
         if submitted and event_details:
             event = {
-                'id': time.time(),
+                'id': next(event_id_counter()),
                 'type': event_type,
                 'details': event_details,
                 'time': datetime.now(),
                 'status': 'Pending'
             }
-            st.session_state.events.insert(0, event)
+            st.session_state.events.appendleft(event)
             save_events(st.session_state.events)
             st.success("Event added successfully!")
             st.rerun()
@@ -415,15 +556,17 @@ elif page == "Entry Points":
     if not st.session_state.events:
         st.info("No events yet.")
     else:
-        for event in st.session_state.events[:10]:
-            with st.container():
-                st.markdown(f"""
-                <div class="event-card">
-                    <strong>{event['type']}</strong> - {event['details']}<br>
-                    <span style="color:#888;font-size:0.9em;">({time_ago(event['time'])})</span><br>
-                    <span>Status: {event['status']}</span>
-                </div>
-                """, unsafe_allow_html=True)
+        now = datetime.now()
+        # Render all cards in one markdown element instead of one per event
+        event_cards = "".join(
+            f'<div class="event-card">'
+            f"<strong>{event['type']}</strong> - {event['details']}<br>"
+            f'<span style="color:#888;font-size:0.9em;">({time_ago(now, event["time"])})</span><br>'
+            f"<span>Status: {event['status']}</span>"
+            f"</div>"
+            for event in islice(st.session_state.events, 10)
+        )
+        st.markdown(event_cards, unsafe_allow_html=True)
 
 elif page == "Orchestrator":
     st.title("Smart Orchestrator")
@@ -433,15 +576,16 @@ elif page == "Orchestrator":
     if not st.session_state.orchestrator_log:
         st.info("No orchestrator decisions yet.")
     else:
-        for entry in st.session_state.orchestrator_log[:10]:
-            with st.container():
-                st.markdown(f"""
-                <div class="orchestrator-entry">
-                    <strong>{entry['event']['type']}</strong> - {entry['event']['details']}<br>
-                    <span>Answers: {', '.join(['Yes' if a else 'No' for a in entry['answers']])}</span><br>
-                    <span>Outcome: <span style="color:{entry['color']}">{entry['outcome']}</span></span>
-                </div>
-                """, unsafe_allow_html=True)
+        # Render all entries in one markdown element instead of one per decision
+        entry_cards = "".join(
+            f'<div class="orchestrator-entry">'
+            f"<strong>{entry['event']['type']}</strong> - {entry['event']['details']}<br>"
+            f"<span>Answers: {', '.join(['Yes' if a else 'No' for a in entry['answers']])}</span><br>"
+            f"<span>Outcome: <span style=\"color:{entry['color']}\">{entry['outcome']}</span></span>"
+            f"</div>"
+            for entry in islice(st.session_state.orchestrator_log, 10)
+        )
+        st.markdown(entry_cards, unsafe_allow_html=True)
 
 elif page == "Alert Matrix":
     st.title("Alert Matrix")
@@ -450,6 +594,7 @@ elif page == "Alert Matrix":
     if not st.session_state.alerts:
         st.info("No alerts yet.")
     else:
+        now = datetime.now()
         for alert in st.session_state.alerts:
             if not alert['dismissed']:
                 with st.container():
@@ -459,7 +604,7 @@ elif page == "Alert Matrix":
                         <p><strong>Event:</strong> {alert['event']['type']} - {alert['event']['details']}</p>
                         <p><strong>Auto Action:</strong> {alert['auto']}</p>
                         <p><strong>Urgency:</strong> {format_urgency(alert)}</p>
-                        <p><strong>Created:</strong> {time_ago(alert['created'])}</p>
+                        <p><strong>Created:</strong> {time_ago(now, alert['created'])}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     
@@ -478,8 +623,7 @@ elif page == "Dashboard":
     with col1:
         # Asset Map
         st.subheader("Asset Map")
-        asset_df = pd.DataFrame(assets)
-        st.dataframe(asset_df, use_container_width=True)
+        st.dataframe(ASSET_DF, use_container_width=True)
         
         # Compliance Gauge
         st.subheader("Compliance Gauge")
@@ -494,8 +638,7 @@ elif page == "Dashboard":
         
         # Training Status
         st.subheader("Training Status")
-        training_df = pd.DataFrame(training)
-        st.dataframe(training_df, use_container_width=True)
+        st.dataframe(TRAINING_DF, use_container_width=True)
     
     # AI Insights
     st.subheader("AI Insights")
@@ -506,35 +649,46 @@ elif page == "Dashboard":
     st.subheader("AI-Generated Todo List")
     ai_todos = st.session_state.todos
     if api_key and st.session_state.events:
-        # Use the same prompt as in AI Analysis, but ask for prioritized action items and risk for each event
-        events_text = "\n".join([f"{e['type']}: {e['details']} (Status: {e['status']})" for e in st.session_state.events[:10]])
-        todo_prompt = f"""Analyze these chemical facility events and for each event, provide:\n- A risk level (High, Medium, Low)\n- A recommended action item\nFormat as: Event: <event details> | Risk: <risk> | Action: <todo>\n\nRecent Events:\n{events_text}\n"""
-        with st.spinner("Generating AI todo list and risk assessment from events..."):
-            ai_todo_text = call_gemini_api(todo_prompt, api_key)
-            if ai_todo_text:
-                # Parse AI response for todos and risk
-                new_todos = []
-                for line in ai_todo_text.splitlines():
-                    if '| Risk:' in line and '| Action:' in line:
-                        parts = line.split('|')
-                        event_part = parts[0].replace('Event:', '').strip()
-                        risk_part = parts[1].replace('Risk:', '').strip()
-                        action_part = parts[2].replace('Action:', '').strip()
+        refresh_clicked = st.button("Refresh AI Todos")
+        # Only regenerate when the recent events changed or the user asks for it,
+        # so toggling a todo checkbox does not trigger another LLM round trip
+        events_hash = recent_events_hash()
+        if refresh_clicked or st.session_state.get('_last_todo_hash') != events_hash:
+            st.session_state._last_todo_hash = events_hash
+            # Use the same prompt as in AI Analysis, but ask for prioritized action items and risk for each event
+            events_text = recent_events_text(events_hash)
+            todo_prompt = f"""Analyze these chemical facility events and for each event, provide:\n- A risk level (High, Medium, Low)\n- A recommended action item\nFormat as: Event: <event details> | Risk: <risk> | Action: <todo>\n\nRecent Events:\n{events_text}\n"""
+            with st.spinner("Generating AI todo list and risk assessment from events..."):
+                ai_todo_text = call_gemini_api(todo_prompt, api_key, use_cache=not refresh_clicked)
+                if ai_todo_text:
+                    # Parse AI response for todos and risk
+                    new_todos = []
+                    # A new browser session has no _last_todo_hash and regenerates once, so carry
+                    # over completed items from the persisted list instead of resetting them
+                    done_keys = {(t['event'], t['action']) for t in st.session_state.todos if t.get('done')}
+                    # Exact-match index; substring scan is only the fallback
+                    details_index = {}
+                    for e in st.session_state.events:
+                        details_index.setdefault(e['details'], e)
+                    for m in _TODO_RE.finditer(ai_todo_text):
+                        event_part, risk_part, action_part = m.groups()
                         new_todos.append({
                             'event': event_part,
                             'risk': risk_part,
                             'action': action_part,
-                            'done': False
+                            'done': (event_part, action_part) in done_keys
                         })
                         # Also create/update alert for this event
-                        matching_event = next((e for e in st.session_state.events if event_part in e['details']), None)
+                        matching_event = details_index.get(event_part)
+                        if matching_event is None:
+                            matching_event = next((e for e in st.session_state.events if event_part in e['details']), None)
                         if matching_event:
                             add_alert_dynamic(matching_event, risk_part, auto_action=action_part)
-                if new_todos:
-                    st.session_state.todos = new_todos
-                    save_todos(new_todos)
-                    ai_todos = new_todos
-            # else: keep previous todos
+                    if new_todos:
+                        st.session_state.todos = new_todos
+                        save_todos(new_todos)
+                        ai_todos = new_todos
+                # else: keep previous todos
     # Display interactive todo list
     if ai_todos:
         for idx, todo in enumerate(ai_todos):
@@ -556,10 +710,27 @@ elif page == "Documentation":
         st.success("Image uploaded successfully!")
     
     # Generate report button
-    if st.button("Generate Compliance Report"):
-        st.info("Generating compliance report...")
-        time.sleep(2)
-        st.success("Report generated successfully!")
+    if st.button("Generate Compliance Report", disabled=not api_key):
+        report_prompt = f"""Generate a compliance report for a chemical energy facility with the following data:
+
+Compliance Rate: {compliance}%
+Recent Events:
+{recent_events_text(recent_events_hash()) or "None"}
+Inspection Photo: {uploaded_file.name if uploaded_file is not None else "None uploaded"}
+
+Please provide:
+1. Compliance Status Summary
+2. Identified Gaps
+3. Corrective Actions
+4. Documentation Requirements"""
+        
+        with st.spinner("Generating compliance report..."):
+            result = call_gemini_api(report_prompt, api_key)
+        if result and not is_api_error(result):
+            st.success("Report generated successfully!")
+            st.text_area("Compliance Report:", value=result, height=300)
+        else:
+            st.error(f"Failed to generate compliance report: {result}" if result else "Failed to generate compliance report")
     
     # Documentation panel
     st.subheader("Documentation Panel")
@@ -582,7 +753,7 @@ elif page == "AI Analysis":
         st.subheader("🤖 AI-Generated Insights")
         
         # Analyze recent events for patterns and insights
-        events_text = "\n".join([f"{e['type']}: {e['details']} (Status: {e['status']})" for e in st.session_state.events[:10]])
+        events_text = recent_events_text(recent_events_hash())
         
         analysis_prompt = f"""Analyze these chemical facility events and provide actionable insights:
 
@@ -598,13 +769,21 @@ Provide a concise analysis with:
 
 Format as bullet points for easy reading."""
         
-        with st.spinner("Generating AI insights from events..."):
-            ai_analysis = call_gemini_api(analysis_prompt, api_key)
-            if ai_analysis:
-                st.markdown("### 📊 Event Analysis")
-                st.write(ai_analysis)
+        st.markdown("### 📊 Event Analysis")
+        if st.session_state.get('_ai_insights_prompt') == analysis_prompt:
+            st.write(st.session_state._ai_insights_text)
+        else:
+            # Stream the first generation live; reruns reuse the finished text
+            try:
+                ai_analysis = st.write_stream(stream_gemini_api(analysis_prompt, api_key))
+            except Exception as e:
+                st.error(f"Failed to generate AI analysis: {e}")
             else:
-                st.error("Failed to generate AI analysis")
+                if ai_analysis:
+                    st.session_state._ai_insights_prompt = analysis_prompt
+                    st.session_state._ai_insights_text = ai_analysis
+                else:
+                    st.error("Failed to generate AI analysis")
     
     # Manual analysis tools
     st.subheader("Manual Analysis Tools")
@@ -612,78 +791,87 @@ Format as bullet points for easy reading."""
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("Analyze Recent Events", disabled=not api_key):
-            if st.session_state.events:
-                events_text = "\n".join([f"{e['type']}: {e['details']}" for e in st.session_state.events[:5]])
-                prompt = f"""Analyze these recent chemical facility events and provide insights on patterns, risks, and recommendations:
+        analyze_clicked = st.button("Analyze Recent Events", disabled=not api_key)
+        if analyze_clicked and not st.session_state.events:
+            st.warning("No events to analyze")
+            analyze_clicked = False
+    with col2:
+        report_clicked = st.button("Generate AI Report", disabled=not api_key)
+    with col3:
+        maintenance_clicked = st.button("Predict Maintenance Needs", disabled=not api_key)
+    
+    if analyze_clicked or report_clicked or maintenance_clicked:
+        # One combined request serves all three tools; each button renders its own section
+        events_text = "\n".join(f"- {e['type']}: {e['details']}" for e in islice(st.session_state.events, 5)) or "- None"
+        assets_text = "\n".join([f"- {a['name']}: {a['status']} ({a['risk']} risk)" for a in assets])
+        batch_prompt = f"""You are assisting a chemical energy facility. Using the data below, answer all three sections.
+Start each section with its marker line exactly as written and do not add any other section markers.
 
-Events:
+Facility Data:
+Compliance Rate: {compliance}%
+Cost: ${cost}{cost_unit}
+Recent Events: {len(st.session_state.events)} events
 {events_text}
+Assets: {len(assets)} assets monitored
+{assets_text}
 
-Please provide a detailed analysis including:
+### SECTION: EVENT_ANALYSIS
+Analyze the recent events and provide a detailed analysis including:
 1. Risk assessment
 2. Pattern identification
 3. Recommended actions
-4. Compliance implications"""
-                
-                with st.spinner("Analyzing events with Gemini AI..."):
-                    result = call_gemini_api(prompt, api_key)
-                    if result:
-                        st.text_area("Analysis Results:", value=result, height=300)
-                    else:
-                        st.error("Failed to get AI analysis")
-            else:
-                st.warning("No events to analyze")
-    
-    with col2:
-        if st.button("Generate AI Report", disabled=not api_key):
-            # Include events data in the report
-            events_summary = ""
-            if st.session_state.events:
-                events_summary = f"\nRecent Events Summary:\n" + "\n".join([f"- {e['type']}: {e['details']}" for e in st.session_state.events[:5]])
-            
-            prompt = f"""Generate a comprehensive AI report for a chemical energy facility with the following data:
-
-Compliance Rate: {compliance}%
-Cost: ${cost}{cost_unit}
-Recent Events: {len(st.session_state.events)} events{events_summary}
-Assets: {len(assets)} assets monitored
+4. Compliance implications
 
-Please provide:
+### SECTION: REPORT
+Generate a comprehensive AI report for the facility including:
 1. Executive Summary
 2. Key Performance Indicators
 3. Risk Assessment
 4. Recommendations
-5. Next Steps"""
-            
-            with st.spinner("Generating AI report with Gemini..."):
-                result = call_gemini_api(prompt, api_key)
-                if result:
-                    st.text_area("AI Report:", value=result, height=300)
-                else:
-                    st.error("Failed to generate AI report")
-    
-    with col3:
-        if st.button("Predict Maintenance Needs", disabled=not api_key):
-            assets_text = "\n".join([f"{a['name']}: {a['status']} ({a['risk']} risk)" for a in assets])
-            prompt = f"""Based on the following asset data, predict maintenance needs and provide recommendations:
-
-Assets:
-{assets_text}
+5. Next Steps
 
-Please provide:
+### SECTION: MAINTENANCE
+Predict maintenance needs for each asset including:
 1. Maintenance predictions for each asset
 2. Priority recommendations
 3. Timeline suggestions
 4. Cost implications
 5. Risk mitigation strategies"""
-            
-            with st.spinner("Predicting maintenance with Gemini AI..."):
-                result = call_gemini_api(prompt, api_key)
-                if result:
-                    st.text_area("Maintenance Predictions:", value=result, height=300)
+        
+        if st.session_state.get('_ai_batch_prompt') != batch_prompt:
+            # After an incomplete response, bypass the hour-long cache so the retry is a fresh request
+            use_cache = st.session_state.get('_ai_batch_failed_prompt') != batch_prompt
+            with st.spinner("Running AI analysis with Gemini..."):
+                result = call_gemini_api(batch_prompt, api_key, use_cache=use_cache)
+            st.session_state._ai_batch_prompt = batch_prompt
+            st.session_state._ai_batch_sections = split_ai_sections(result) if result else {}
+            # A response without any markers is usually an API error string; keep it to show the reason
+            st.session_state._ai_batch_error = result if not st.session_state._ai_batch_sections else None
+        sections = st.session_state._ai_batch_sections
+        batch_error = st.session_state._ai_batch_error
+        if not all(sections.get(name) for name in ("EVENT_ANALYSIS", "REPORT", "MAINTENANCE")):
+            # Let the next click retry instead of reusing a response with a missing section
+            st.session_state._ai_batch_prompt = None
+            st.session_state._ai_batch_failed_prompt = batch_prompt
+        
+        if analyze_clicked:
+            with col1:
+                if sections.get("EVENT_ANALYSIS"):
+                    st.text_area("Analysis Results:", value=sections["EVENT_ANALYSIS"], height=300)
+                else:
+                    st.error(f"Failed to get AI analysis: {batch_error}" if batch_error else "Failed to get AI analysis")
+        if report_clicked:
+            with col2:
+                if sections.get("REPORT"):
+                    st.text_area("AI Report:", value=sections["REPORT"], height=300)
+                else:
+                    st.error(f"Failed to generate AI report: {batch_error}" if batch_error else "Failed to generate AI report")
+        if maintenance_clicked:
+            with col3:
+                if sections.get("MAINTENANCE"):
+                    st.text_area("Maintenance Predictions:", value=sections["MAINTENANCE"], height=300)
                 else:
-                    st.error("Failed to predict maintenance needs")
+                    st.error(f"Failed to predict maintenance needs: {batch_error}" if batch_error else "Failed to predict maintenance needs")
 
 elif page == "Benefits":
     st.title("Benefits Comparison")
@@ -691,23 +879,12 @@ elif page == "Benefits":
     # Benefits table
     st.subheader("Legacy vs New System Benefits")
     
-    benefits_df = pd.DataFrame([
-        {"Feature": feature, "Description": description}
-        for feature, description in benefits_info.items()
-    ])
-    
-    st.dataframe(benefits_df, use_container_width=True)
+    st.dataframe(BENEFITS_DF, use_container_width=True)
     
     # Additional benefits visualization
     st.subheader("Key Benefits Summary")
     
-    benefits_data = {
-        'Feature': list(benefits_info.keys()),
-        'Benefit_Score': [95, 90, 85, 80, 75]  # Example scores
-    }
-    
-    benefits_chart_df = pd.DataFrame(benefits_data)
-    fig = px.bar(benefits_chart_df, x='Feature', y='Benefit_Score', 
+    fig = px.bar(BENEFITS_CHART_DF, x='Feature', y='Benefit_Score', 
                  title="Benefit Impact Scores",
                  color='Benefit_Score',
                  color_continuous_scale='viridis')